@@ -0,0 +1,289 @@
+"""
+Keypoint container shared by the pose estimators and the data pipeline.
+
+KeypointSequence is the common container for keypoints across the pipeline.
+Coordinates and visibility of every frame live in two contiguous arrays
+(optionally quantized to float16 or int16) instead of per-frame dicts or
+landmark objects, and slicing by frame range or keypoint subset returns
+views without copying the data.
+"""
+
+import csv
+
+import numpy as np
+
+from src.core.skeleton import COMMON_KEYPOINTS
+
+STORAGE_DTYPES = ("float32", "float16", "int16")
+
+# int16 storage keeps 4 decimals of normalized coordinates (< 0.1 px at 720 px)
+INT16_SCALE = 10000.0
+INT16_MISSING = np.iinfo(np.int16).min
+
+
+def _encode(values, dtype):
+    """Convert float values (NaN = missing) to the storage dtype."""
+    values = np.asarray(values, dtype=np.float32)
+    if dtype != "int16":
+        return values.astype(dtype)
+
+    missing = np.isnan(values)
+    scaled = np.clip(np.round(np.nan_to_num(values) * INT16_SCALE), -32767, 32767)
+    encoded = scaled.astype(np.int16)
+    encoded[missing] = INT16_MISSING
+    return encoded
+
+
+def _decode(values):
+    """Convert stored values back to float32 (NaN = missing)."""
+    if values.dtype != np.int16:
+        return values.astype(np.float32)
+
+    decoded = values.astype(np.float32) / INT16_SCALE
+    decoded[values == INT16_MISSING] = np.nan
+    return decoded
+
+
+class KeypointSequence:
+    """
+    Keypoints of one person over a sequence of frames.
+
+    coords has shape (frames, keypoints, dims) with normalized x, y (and z when
+    available) and visibility has shape (frames, keypoints). Missing detections
+    are stored as NaN. frame_ids holds the original frame number of each row
+    and frame_data optional per-frame arrays such as the processing FPS.
+    """
+
+    def __init__(self, coords, visibility, keypoint_names=COMMON_KEYPOINTS,
+                 frame_ids=None, frame_data=None, dtype="float32"):
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown storage dtype '{dtype}'. Available: {STORAGE_DTYPES}")
+
+        coords = np.asarray(coords)
+        visibility = np.asarray(visibility)
+        if coords.ndim != 3 or visibility.shape != coords.shape[:2]:
+            raise ValueError(
+                f"Expected coords (frames, keypoints, dims) and visibility (frames, keypoints), "
+                f"got {coords.shape} and {visibility.shape}"
+            )
+        if len(keypoint_names) != coords.shape[1]:
+            raise ValueError(
+                f"Got {len(keypoint_names)} keypoint names for {coords.shape[1]} keypoints"
+            )
+
+        # Always store compact C-contiguous arrays, also when given strided
+        # views such as the columns of one (frames, keypoints, 4) buffer
+        self._coords = np.ascontiguousarray(
+            coords if coords.dtype == np.dtype(dtype) else _encode(coords, dtype)
+        )
+        self._visibility = np.ascontiguousarray(
+            visibility if visibility.dtype == np.dtype(dtype) else _encode(visibility, dtype)
+        )
+        self.keypoint_names = list(keypoint_names)
+        self.frame_ids = (
+            np.arange(len(coords)) if frame_ids is None else np.asarray(frame_ids)
+        )
+        self.frame_data = {key: np.asarray(value) for key, value in (frame_data or {}).items()}
+
+    @classmethod
+    def from_frames(cls, frames, keypoint_names=COMMON_KEYPOINTS, frame_ids=None,
+                    dtype="float32"):
+        """
+        Build a sequence from per-frame estimator outputs.
+
+        Each frame is an array of shape (keypoints, dims + 1) whose last column
+        is the visibility/score, as returned by the pose estimators, or None
+        when nothing was detected.
+        """
+        num_keypoints = len(keypoint_names)
+        width = next((f.shape[1] for f in frames if f is not None), 3)
+
+        data = np.full((len(frames), num_keypoints, width), np.nan, dtype=np.float32)
+        for i, frame in enumerate(frames):
+            if frame is not None:
+                data[i] = frame
+
+        return cls(data[..., :-1], data[..., -1], keypoint_names, frame_ids, dtype=dtype)
+
+    @classmethod
+    def from_csv(cls, csv_path, dtype="float32"):
+        """
+        Load a keypoints CSV with columns frame, keypoint, x, y, z, visibility
+        and optionally fps (the format written by the MediaPipe experiments).
+        """
+        frame_col, name_col, values, fps = [], [], [], []
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            has_fps = "fps" in (reader.fieldnames or [])
+            for row in reader:
+                frame_col.append(int(row['frame']))
+                name_col.append(row['keypoint'])
+                values.append((float(row['x']), float(row['y']), float(row['z']),
+                               float(row['visibility'])))
+                if has_fps:
+                    fps.append(float(row['fps']))
+
+        keypoint_names = list(dict.fromkeys(name_col))
+        frame_ids, frame_rows = np.unique(np.asarray(frame_col, dtype=np.int64), return_inverse=True)
+        name_index = {name: i for i, name in enumerate(keypoint_names)}
+        kp_rows = np.fromiter((name_index[n] for n in name_col), dtype=np.int64, count=len(name_col))
+
+        data = np.full((len(frame_ids), len(keypoint_names), 4), np.nan, dtype=np.float32)
+        data[frame_rows, kp_rows] = np.asarray(values, dtype=np.float32).reshape(-1, 4)
+
+        frame_data = {}
+        if has_fps:
+            frame_fps = np.zeros(len(frame_ids), dtype=np.float32)
+            frame_fps[frame_rows] = fps
+            frame_data["fps"] = frame_fps
+
+        return cls(data[..., :3], data[..., 3], keypoint_names, frame_ids, frame_data, dtype)
+
+    @classmethod
+    def load(cls, path):
+        """Load a sequence saved with save()."""
+        with np.load(path) as archive:
+            frame_data = {
+                key[len("frame_data_"):]: archive[key]
+                for key in archive.files if key.startswith("frame_data_")
+            }
+            return cls(
+                archive["coords"],
+                archive["visibility"],
+                archive["keypoint_names"].tolist(),
+                archive["frame_ids"],
+                frame_data,
+                dtype=str(archive["coords"].dtype),
+            )
+
+    def save(self, path):
+        """Save the sequence (in its storage dtype) as a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            coords=self._coords,
+            visibility=self._visibility,
+            keypoint_names=np.asarray(self.keypoint_names),
+            frame_ids=self.frame_ids,
+            **{f"frame_data_{key}": value for key, value in self.frame_data.items()},
+        )
+
+    def __len__(self):
+        return len(self._coords)
+
+    def __repr__(self):
+        return (f"KeypointSequence(frames={len(self)}, keypoints={self.num_keypoints}, "
+                f"dtype={self.dtype})")
+
+    def __getitem__(self, frames):
+        """Frame range view, e.g. sequence[100:200]. Shares memory with self."""
+        if not isinstance(frames, slice):
+            raise TypeError("KeypointSequence only supports slicing by frame range")
+        return self._view(frames, slice(None))
+
+    def _view(self, frames, keypoints):
+        view = KeypointSequence.__new__(KeypointSequence)
+        view._coords = self._coords[frames, keypoints]
+        view._visibility = self._visibility[frames, keypoints]
+        view.keypoint_names = self.keypoint_names[keypoints]
+        view.frame_ids = self.frame_ids[frames]
+        view.frame_data = {key: value[frames] for key, value in self.frame_data.items()}
+        return view
+
+    def select(self, keypoint_names):
+        """
+        Keypoint subset. Returns a view when the names are contiguous and
+        in order (e.g. all left-side joints), otherwise a compact copy.
+        """
+        if len(keypoint_names) == 0:
+            raise ValueError("select() needs at least one keypoint name")
+
+        indices = [self.keypoint_index(name) for name in keypoint_names]
+        start, stop = indices[0], indices[-1] + 1
+        if indices == list(range(start, stop)):
+            return self._view(slice(None), slice(start, stop))
+
+        return KeypointSequence(
+            self._coords[:, indices],
+            self._visibility[:, indices],
+            keypoint_names,
+            self.frame_ids,
+            self.frame_data,
+            dtype=self.dtype,
+        )
+
+    def keypoint_index(self, name):
+        """Column index of a keypoint name."""
+        try:
+            return self.keypoint_names.index(name)
+        except ValueError:
+            raise KeyError(f"Keypoint '{name}' not in sequence") from None
+
+    @property
+    def dtype(self):
+        return str(self._coords.dtype)
+
+    @property
+    def num_keypoints(self):
+        return self._coords.shape[1]
+
+    @property
+    def nbytes(self):
+        """Memory used by the coordinate and visibility arrays."""
+        return self._coords.nbytes + self._visibility.nbytes
+
+    @property
+    def raw_coords(self):
+        """Coordinates in their storage dtype, without decoding."""
+        return self._coords
+
+    @property
+    def raw_visibility(self):
+        """Visibility in its storage dtype, without decoding."""
+        return self._visibility
+
+    @property
+    def coords(self):
+        """Coordinates as float32, shape (frames, keypoints, dims)."""
+        return _decode(self._coords)
+
+    @property
+    def visibility(self):
+        """Visibility/score as float32, shape (frames, keypoints)."""
+        return _decode(self._visibility)
+
+    @property
+    def detected(self):
+        """Boolean mask (frames, keypoints) of keypoints present in the data."""
+        return ~np.isnan(self.visibility)
+
+    def point(self, name):
+        """Coordinates of one keypoint over all frames, shape (frames, dims)."""
+        return _decode(self._coords[:, self.keypoint_index(name)])
+
+    def astype(self, dtype):
+        """Copy of the sequence using another storage dtype."""
+        return KeypointSequence(
+            self.coords, self.visibility, self.keypoint_names,
+            self.frame_ids, self.frame_data, dtype=dtype,
+        )
+
+    def to_pixels(self, frame_size, min_score=0.0):
+        """
+        x, y in pixel coordinates, shape (frames, keypoints, 2).
+
+        Keypoints with visibility below min_score are set to NaN.
+        """
+        width, height = frame_size
+        points = self.coords[..., :2] * np.array([width, height], dtype=np.float32)
+        points[~(self.visibility >= min_score)] = np.nan
+        return points
+
+
+def landmarks_to_array(landmarks, indices=None):
+    """
+    Convert MediaPipe landmarks to an array of shape (keypoints, 4) with
+    x, y, z and visibility, optionally keeping only the given indices.
+    """
+    if indices is not None:
+        landmarks = [landmarks[i] for i in indices]
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks], dtype=np.float32)
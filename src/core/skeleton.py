@@ -0,0 +1,35 @@
+"""
+Common skeleton shared by all pose estimators.
+
+MediaPipe predicts 33 landmarks while MoveNet and YOLO11 Pose follow the
+17-keypoint COCO layout. Every estimator maps its output onto the COCO
+keypoints so results from different models can be compared joint by joint.
+"""
+
+COMMON_KEYPOINTS = [
+    "nose",
+    "left_eye",
+    "right_eye",
+    "left_ear",
+    "right_ear",
+    "left_shoulder",
+    "right_shoulder",
+    "left_elbow",
+    "right_elbow",
+    "left_wrist",
+    "right_wrist",
+    "left_hip",
+    "right_hip",
+    "left_knee",
+    "right_knee",
+    "left_ankle",
+    "right_ankle",
+]
+
+KEYPOINT_INDEX = {name: i for i, name in enumerate(COMMON_KEYPOINTS)}
+
+# MediaPipe PoseLandmark index of each common keypoint
+MEDIAPIPE_INDICES = [0, 2, 5, 7, 8, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28]
+
+# MoveNet and YOLO11 Pose already use the COCO order
+COCO_INDICES = list(range(len(COMMON_KEYPOINTS)))
@@ -3,15 +3,20 @@ Analyze MediaPipe keypoints CSV and generate a Markdown evaluation report.
 
 Automatically extracts parameters from file name and saves report in:
 results/mediapipe/reports/
+
+Usage (from the project root):
+    python -m src.data_pipeline.analyze_keypoints --file <keypoints.csv>
 """
 
 import argparse
-import csv
 import re
-import statistics
-from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
+
+from src.core.keypoints import KeypointSequence
+from src.utils.checkpoint_utils import read_checkpoint
+
 parser = argparse.ArgumentParser(
     description="Analyze keypoints CSV and generate evaluation report."
 )
@@ -45,33 +50,20 @@ else:
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
-frames_data = defaultdict(list)
-keypoint_stats = defaultdict(lambda: {"visibilities": [], "frames_detected": 0})
-frame_fps = {}
-
-total_frames = 0
-total_detections = 0
-has_fps_column = False
-
-with open(csv_path, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        frame_id = int(row['frame'])
-        keypoint = row['keypoint']
-        visibility = float(row['visibility'])
-        
-        if 'fps' in row:
-            has_fps_column = True
-            if frame_id not in frame_fps:
-                fps = float(row['fps'])
-                if fps > 0:
-                    frame_fps[frame_id] = fps
-
-        total_detections += 1
-        keypoint_stats[keypoint]["visibilities"].append(visibility)
-        keypoint_stats[keypoint]["frames_detected"] += 1
-        frames_data[frame_id].append(visibility)
-        total_frames = max(total_frames, frame_id)
+sequence = KeypointSequence.from_csv(csv_path)
+visibility = sequence.visibility
+detected = sequence.detected
+
+# CSVs written by process_videos have a checkpoint with the number of frames
+# actually processed; with --fps their frame numbers are sparse, so the
+# highest frame number would overstate it
+checkpoint = read_checkpoint(csv_path)
+if checkpoint and "frames_processed" in checkpoint:
+    total_frames = checkpoint["frames_processed"]
+else:
+    total_frames = int(sequence.frame_ids.max()) if len(sequence) else 0
+total_detections = int(detected.sum())
+has_fps_column = "fps" in sequence.frame_data
 
 lines = []
 lines.append(f"# Informe de Evaluación — MediaPipe Pose")
@@ -86,26 +78,24 @@ lines.append("")
 lines.append("## 1. Resumen General")
 lines.append(f"- Total frames procesados: **{total_frames}**")
 lines.append(f"- Total detecciones: **{total_detections}**")
-lines.append(f"- Keypoints analizados: **{len(keypoint_stats)}**")
+lines.append(f"- Keypoints analizados: **{sequence.num_keypoints}**")
 lines.append("")
 
 lines.append("## 2. Estadísticas por Keypoint")
 lines.append("")
 
-sorted_keypoints = sorted(
-    keypoint_stats.items(),
-    key=lambda x: statistics.mean(x[1]["visibilities"]),
-    reverse=True
-)
+frames_detected = detected.sum(axis=0)
+avg_vis_per_keypoint = np.nanmean(visibility, axis=0)
 
-for keypoint, stats in sorted_keypoints:
-    vis = stats["visibilities"]
-    avg_vis = statistics.mean(vis)
-    median_vis = statistics.median(vis)
-    min_vis = min(vis)
-    max_vis = max(vis)
-    std_vis = statistics.stdev(vis) if len(vis) > 1 else 0
-    coverage = stats["frames_detected"] / total_frames * 100
+for k in np.argsort(-avg_vis_per_keypoint, kind="stable"):
+    keypoint = sequence.keypoint_names[k]
+    vis = visibility[detected[:, k], k]
+    avg_vis = avg_vis_per_keypoint[k]
+    median_vis = np.median(vis)
+    min_vis = vis.min()
+    max_vis = vis.max()
+    std_vis = vis.std(ddof=1) if len(vis) > 1 else 0
+    coverage = frames_detected[k] / total_frames * 100
 
     lines.append(f"### {keypoint}")
     lines.append(f"- Visibilidad promedio: **{avg_vis*100:.2f}%**")
@@ -115,22 +105,24 @@ for keypoint, stats in sorted_keypoints:
     lines.append(f"- Cobertura: **{coverage:.2f}%**")
     lines.append("")
 
-all_vis = [v for kp in keypoint_stats.values() for v in kp["visibilities"]]
-overall_avg = statistics.mean(all_vis)
-overall_median = statistics.median(all_vis)
+all_vis = visibility[detected]
+overall_avg = all_vis.mean()
+overall_median = np.median(all_vis)
 
 lines.append("## 3. Calidad General")
 lines.append(f"- Visibilidad promedio general: **{overall_avg*100:.2f}%**")
 lines.append(f"- Mediana general: {overall_median:.4f}")
 lines.append("")
 
-if has_fps_column and frame_fps:
-    fps_values = list(frame_fps.values())
-    avg_fps = statistics.mean(fps_values)
-    median_fps = statistics.median(fps_values)
-    min_fps = min(fps_values)
-    max_fps = max(fps_values)
-    std_fps = statistics.stdev(fps_values) if len(fps_values) > 1 else 0
+fps_values = sequence.frame_data["fps"] if has_fps_column else np.empty(0)
+fps_values = fps_values[fps_values > 0]
+
+if fps_values.size:
+    avg_fps = fps_values.mean()
+    median_fps = np.median(fps_values)
+    min_fps = fps_values.min()
+    max_fps = fps_values.max()
+    std_fps = fps_values.std(ddof=1) if len(fps_values) > 1 else 0
     
     lines.append("## 4. Rendimiento (FPS)")
     lines.append(f"- FPS promedio: **{avg_fps:.2f}**")
@@ -0,0 +1,347 @@
+"""
+Compare MediaPipe, MoveNet and YOLO11 Pose on the same video frames.
+
+Each video is decoded only once. Every frame is sent to all configured
+backends (in parallel, one worker per backend) and their outputs are mapped
+onto the common COCO skeleton, so agreement metrics between models can be
+computed joint by joint. The comparative Markdown report is saved in:
+results/comparison/reports/
+
+Usage (from the project root):
+    python -m src.data_pipeline.compare_models --video data/raw/Sentadilla.mp4
+"""
+
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+from src.core.keypoints import KeypointSequence
+from src.core.skeleton import COMMON_KEYPOINTS, KEYPOINT_INDEX
+from src.utils.angle_utils import JOINT_ANGLES, sequence_angles
+from src.utils.video_utils import VideoReader
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+REPORTS_DIR = PROJECT_ROOT / "results" / "comparison" / "reports"
+
+AVAILABLE_BACKENDS = ["mediapipe", "movenet", "yolo11"]
+
+# pip packages needed by each backend (only mediapipe is in requirements.txt)
+BACKEND_PACKAGES = {
+    "mediapipe": "mediapipe",
+    "movenet": "tensorflow tensorflow-hub",
+    "yolo11": "ultralytics",
+}
+
+
+def create_estimator(name):
+    """
+    Instantiate a pose estimator by name, importing its dependencies lazily.
+
+    Raises ImportError with installation instructions if the backend's
+    packages are missing.
+    """
+    if name not in AVAILABLE_BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Available: {AVAILABLE_BACKENDS}")
+
+    try:
+        if name == "mediapipe":
+            from src.pose_estimators.mediapipe_pose import MediaPipePose
+            return MediaPipePose()
+        if name == "movenet":
+            from src.pose_estimators.movenet_pose import MoveNetPose
+            return MoveNetPose()
+        from src.pose_estimators.yolo11_pose import Yolo11Pose
+        return Yolo11Pose()
+    except ImportError as e:
+        raise ImportError(
+            f"Backend '{name}' is not available ({e}). Install it with "
+            f"'pip install {BACKEND_PACKAGES[name]}' or drop it from --backends."
+        ) from e
+
+
+def _timed_process(estimator, frame):
+    """Run one estimator on a frame and measure its latency in seconds."""
+    start = time.perf_counter()
+    keypoints = estimator.process(frame)
+    return keypoints, time.perf_counter() - start
+
+
+def default_workers(backends):
+    """One inference worker per backend, limited by the available cores."""
+    return min(len(backends), os.cpu_count() or 1)
+
+
+def run_backends(reader, backends, workers=None):
+    """
+    Decode the video of a VideoReader once and run every backend on each frame.
+
+    With workers > 1 the backends run concurrently on each frame, so their
+    latencies include contention for the shared cores. With workers=1 they
+    run one after another and each latency is measured in isolation.
+
+    Returns (keypoints, latencies) where keypoints maps each backend to a
+    KeypointSequence (NaN for frames without detection) and latencies maps
+    each backend to per-frame latencies in seconds.
+    """
+    if workers is None:
+        workers = default_workers(backends)
+
+    estimators = []
+    try:
+        for name in backends:
+            estimators.append(create_estimator(name))
+    except ImportError:
+        for est in estimators:
+            est.close()
+        raise
+
+    keypoints = {name: [] for name in backends}
+    latencies = {name: [] for name in backends}
+    frame_ids = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for frame_id, frame in reader:
+                frame_ids.append(frame_id)
+
+                # Each estimator only ever sees one frame at a time, in order,
+                # so trackers keep their temporal state
+                futures = [pool.submit(_timed_process, est, frame) for est in estimators]
+                for name, future in zip(backends, futures):
+                    kps, latency = future.result()
+                    keypoints[name].append(kps)
+                    latencies[name].append(latency)
+
+                if len(frame_ids) % 50 == 0:
+                    print(f"Processed {len(frame_ids)} frames | Decode: {reader.decode_fps:.1f} FPS")
+    finally:
+        for est in estimators:
+            est.close()
+
+    keypoints = {
+        name: KeypointSequence.from_frames(kps, frame_ids=frame_ids)
+        for name, kps in keypoints.items()
+    }
+    latencies = {name: np.asarray(lat) for name, lat in latencies.items()}
+    return keypoints, latencies
+
+
+def _nanmean(values, axis=None):
+    """np.nanmean without warnings for all-NaN slices."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return np.nanmean(values, axis=axis)
+
+
+def torso_size(points):
+    """Per-frame torso length (mean shoulder-hip distance) used to normalize errors."""
+    left = np.linalg.norm(
+        points[:, KEYPOINT_INDEX["left_shoulder"]] - points[:, KEYPOINT_INDEX["left_hip"]], axis=-1
+    )
+    right = np.linalg.norm(
+        points[:, KEYPOINT_INDEX["right_shoulder"]] - points[:, KEYPOINT_INDEX["right_hip"]], axis=-1
+    )
+    return _nanmean(np.stack([left, right]), axis=0)
+
+
+def normalized_distances(points_a, points_b):
+    """
+    Distance between two models for each frame and joint, normalized by the
+    average torso size of both models. Shape (frames, 17), NaN when missing.
+    """
+    distances = np.linalg.norm(points_a - points_b, axis=-1)
+    scale = _nanmean(np.stack([torso_size(points_a), torso_size(points_b)]), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return distances / scale[:, np.newaxis]
+
+
+def pck(distances, threshold=0.2):
+    """Fraction of joints (seen by both models) closer than threshold torso lengths."""
+    valid = ~np.isnan(distances)
+    if not valid.any():
+        return float("nan")
+    return float(np.mean(distances[valid] < threshold))
+
+
+def compare_models(keypoints, frame_size, min_score=0.3, pck_thresholds=(0.1, 0.2)):
+    """
+    Compute agreement metrics for every pair of models.
+
+    Returns a dict keyed by (model_a, model_b) with PCK values, mean
+    per-joint normalized disagreement and mean absolute angle deltas.
+    """
+    points = {name: seq.to_pixels(frame_size, min_score) for name, seq in keypoints.items()}
+    angles = {name: sequence_angles(seq, frame_size, min_score) for name, seq in keypoints.items()}
+
+    pairs = {}
+    for name_a, name_b in combinations(points, 2):
+        distances = normalized_distances(points[name_a], points[name_b])
+        pairs[(name_a, name_b)] = {
+            "pck": {t: pck(distances, t) for t in pck_thresholds},
+            "mean_distance": float(_nanmean(distances)),
+            "joint_distance": _nanmean(distances, axis=0),
+            "angle_delta": _nanmean(np.abs(angles[name_a] - angles[name_b]), axis=0),
+        }
+    return pairs
+
+
+def latency_summary(latencies):
+    """Mean, median and p95 latency (ms) and throughput (FPS) per model."""
+    summary = {}
+    for name, lat in latencies.items():
+        ms = lat * 1000
+        summary[name] = {
+            "mean": float(np.mean(ms)),
+            "median": float(np.median(ms)),
+            "p95": float(np.percentile(ms, 95)),
+            "fps": float(1000 / np.mean(ms)) if np.mean(ms) > 0 else 0.0,
+        }
+    return summary
+
+
+def build_report(video_name, keypoints, latencies, pairs, reader, min_score, workers=1):
+    """Build the comparative Markdown report."""
+    video_info = reader.info
+    width, height = reader.output_size
+    total_frames = len(next(iter(latencies.values())))
+
+    lines = []
+    lines.append("# Informe Comparativo — Modelos de Pose Estimation")
+    lines.append("")
+    lines.append(f"**Video:** {video_name}")
+    lines.append(f"**Resolución original:** {video_info['width']}x{video_info['height']} "
+                 f"@ {video_info['fps']:.2f} FPS")
+    lines.append(f"**Modelos:** {', '.join(keypoints)}")
+    lines.append(f"**Confianza mínima por keypoint:** {min_score:.2f}")
+    lines.append("")
+    lines.append("---")
+    lines.append("")
+    lines.append("## 1. Resumen General")
+    lines.append(f"- Total frames procesados: **{total_frames}**")
+    lines.append(f"- Resolución procesada: **{width}x{height}**")
+    lines.append(f"- Keypoints comunes (esqueleto COCO): **{len(COMMON_KEYPOINTS)}**")
+    lines.append(f"- Frames decodificados: {reader.frames_grabbed} "
+                 f"({reader.decode_fps:.2f} FPS de decodificación)")
+    lines.append("")
+
+    lines.append("## 2. Detección y Latencia por Modelo")
+    lines.append("")
+    if workers > 1 and len(latencies) > 1:
+        lines.append(f"_Latencias medidas con los modelos ejecutándose en paralelo ({workers} workers): "
+                     f"incluyen la competencia por CPU entre modelos. Usar `--workers 1` para "
+                     f"medir cada modelo de forma aislada._")
+    else:
+        lines.append("_Latencias medidas ejecutando los modelos de uno en uno (sin competencia por CPU)._")
+    lines.append("")
+    lines.append("| Modelo | Frames con detección | Latencia media (ms) | Mediana (ms) | P95 (ms) | FPS |")
+    lines.append("|---|---|---|---|---|---|")
+    for name, stats in latency_summary(latencies).items():
+        detected = int(keypoints[name].detected.any(axis=1).sum())
+        coverage = detected / total_frames * 100 if total_frames else 0
+        lines.append(f"| {name} | {detected} ({coverage:.2f}%) | {stats['mean']:.2f} | "
+                     f"{stats['median']:.2f} | {stats['p95']:.2f} | {stats['fps']:.2f} |")
+    lines.append("")
+
+    if not pairs:
+        lines.append("_Se necesitan al menos dos modelos para calcular el acuerdo._")
+        return lines
+
+    pair_names = [f"{a} vs {b}" for a, b in pairs]
+    thresholds = list(next(iter(pairs.values()))["pck"])
+
+    lines.append("## 3. Acuerdo entre Modelos")
+    lines.append("")
+    lines.append("Distancias normalizadas por el tamaño del torso (hombro-cadera).")
+    lines.append("")
+    header = "| Par | " + " | ".join(f"PCK@{t}" for t in thresholds) + " | Distancia media |"
+    lines.append(header)
+    lines.append("|---" * (len(thresholds) + 2) + "|")
+    for pair_name, metrics in zip(pair_names, pairs.values()):
+        pck_values = " | ".join(f"{metrics['pck'][t]*100:.2f}%" for t in thresholds)
+        lines.append(f"| {pair_name} | {pck_values} | {metrics['mean_distance']:.4f} |")
+    lines.append("")
+
+    lines.append("## 4. Desacuerdo por Keypoint")
+    lines.append("")
+    lines.append("| Keypoint | " + " | ".join(pair_names) + " |")
+    lines.append("|---" * (len(pair_names) + 1) + "|")
+    for j, keypoint in enumerate(COMMON_KEYPOINTS):
+        values = " | ".join(f"{m['joint_distance'][j]:.4f}" for m in pairs.values())
+        lines.append(f"| {keypoint} | {values} |")
+    lines.append("")
+
+    lines.append("## 5. Diferencia Angular Media (grados)")
+    lines.append("")
+    lines.append("| Ángulo | " + " | ".join(pair_names) + " |")
+    lines.append("|---" * (len(pair_names) + 1) + "|")
+    for k, angle_name in enumerate(JOINT_ANGLES):
+        values = " | ".join(f"{m['angle_delta'][k]:.2f}" for m in pairs.values())
+        lines.append(f"| {angle_name} | {values} |")
+    lines.append("")
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare pose estimation models on the same video frames."
+    )
+    parser.add_argument("--video", type=str, required=True, help="Path to the video to analyze.")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=AVAILABLE_BACKENDS,
+        choices=AVAILABLE_BACKENDS,
+        help="Models to compare.",
+    )
+    parser.add_argument("--max-width", type=int, default=720, help="Resize frames to this width.")
+    parser.add_argument("--max-frames", type=int, default=None, help="Limit the number of frames.")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="Analyze the video at this frame rate (skipped frames are not decoded).")
+    parser.add_argument("--min-score", type=float, default=0.3, help="Minimum keypoint confidence.")
+    parser.add_argument("--hw-accel", action="store_true",
+                        help="Use hardware video decoding when available.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parallel inference workers (1 measures each model's latency in isolation).")
+    args = parser.parse_args()
+
+    video_path = Path(args.video)
+    if not video_path.exists():
+        print(f"ERROR: File does not exist: {video_path}")
+        exit(1)
+
+    print(f"Comparing {', '.join(args.backends)} on: {video_path.name}")
+
+    reader = VideoReader(video_path, args.max_width, args.fps, max_frames=args.max_frames,
+                         hw_accel=args.hw_accel)
+    workers = args.workers or default_workers(args.backends)
+    try:
+        keypoints, latencies = run_backends(reader, args.backends, workers)
+    except ImportError as e:
+        print(f"ERROR: {e}")
+        exit(1)
+    if reader.frames_returned == 0:
+        print(f"ERROR: No frames could be decoded from {video_path}")
+        exit(1)
+
+    pairs = compare_models(keypoints, reader.output_size, args.min_score)
+    lines = build_report(video_path.stem, keypoints, latencies, pairs, reader, args.min_score,
+                         workers)
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = REPORTS_DIR / f"{video_path.stem}_{'_'.join(args.backends)}_comparison.md"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+
+    print(f"\nReport generated successfully:")
+    print(report_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,84 @@
 """
 Dataset construction from processed videos.
+
+Keypoint files of several videos (CSV from the experiments or .npz saved by
+KeypointSequence) are merged into a single compact .npz dataset, stored
+with float16 coordinates by default, in:
+data/processed/
+
+Usage (from the project root):
+    python -m src.data_pipeline.dataset_builder --files results/mediapipe/keypoints/*.csv
 """
 
-# TODO: Implement dataset construction
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from src.core.keypoints import STORAGE_DTYPES
+from src.data_pipeline.keypoint_processor import load_sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+
+def build_dataset(paths, output_path, dtype="float16"):
+    """
+    Merge the keypoint sequences of several videos into one .npz dataset.
+
+    All sequences must share the same keypoints. The dataset holds the
+    concatenated coords and visibility, the original frame_ids and, for each
+    row, the index of its video in video_names.
+    """
+    sequences = [load_sequence(path, dtype) for path in paths]
+    if not sequences:
+        raise ValueError("No keypoint files given")
+
+    keypoint_names = sequences[0].keypoint_names
+    for path, sequence in zip(paths, sequences):
+        if sequence.keypoint_names != keypoint_names:
+            raise ValueError(
+                f"{path} has keypoints {sequence.keypoint_names}, expected {keypoint_names}"
+            )
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        output_path,
+        coords=np.concatenate([seq.raw_coords for seq in sequences]),
+        visibility=np.concatenate([seq.raw_visibility for seq in sequences]),
+        keypoint_names=np.asarray(keypoint_names),
+        frame_ids=np.concatenate([seq.frame_ids for seq in sequences]),
+        video_ids=np.repeat(np.arange(len(sequences)), [len(seq) for seq in sequences]),
+        video_names=np.asarray([Path(path).stem for path in paths]),
+    )
+
+    total_frames = sum(len(seq) for seq in sequences)
+    total_bytes = sum(seq.nbytes for seq in sequences)
+    print(f"Dataset with {len(sequences)} videos and {total_frames} frames "
+          f"({total_bytes / 1024:.1f} KiB of keypoints) saved at: {output_path}")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a keypoint dataset from processed videos."
+    )
+    parser.add_argument("--files", nargs="+", required=True,
+                        help="Keypoint files (.csv or .npz) to include.")
+    parser.add_argument("--output", type=str, default=str(PROCESSED_DIR / "keypoints_dataset.npz"),
+                        help="Output .npz path.")
+    parser.add_argument("--dtype", type=str, default="float16", choices=STORAGE_DTYPES,
+                        help="Storage type of coordinates and visibility.")
+    args = parser.parse_args()
+
+    missing = [path for path in args.files if not Path(path).exists()]
+    if missing:
+        print(f"ERROR: File does not exist: {missing[0]}")
+        exit(1)
+
+    build_dataset(args.files, args.output, args.dtype)
 
 
+if __name__ == "__main__":
+    main()
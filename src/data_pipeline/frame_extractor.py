@@ -1,7 +1,275 @@
 """
 Frame extraction from videos.
+
+Instead of saving every Nth frame, only informative frames are kept: frames
+are selected when enough motion has accumulated since the last saved frame
+(or at the movement phases of a keypoint signal, e.g. the knee angle), and
+near-duplicates of recently saved frames are dropped using block-mean
+signatures. Selected frames are
+encoded to images on a thread pool while decoding continues. Frames are saved in:
+data/interim/frames/<video_name>/
+
+Usage (from the project root):
+    python -m src.data_pipeline.frame_extractor --video data/raw/Sentadilla.mp4
+    python -m src.data_pipeline.frame_extractor --video data/raw/Sentadilla.mp4 \
+        --phase-csv results/mediapipe/keypoints/Sentadilla_c2_d50_t50.csv
 """
 
-# TODO: Implement frame extraction
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.core.keypoints import KeypointSequence
+from src.utils.angle_utils import calculate_angle
+from src.utils.video_utils import VideoReader
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+FRAMES_DIR = PROJECT_ROOT / "data" / "interim" / "frames"
+
+MOTION_WIDTH = 160
+SIGNATURE_SIZE = 32
+
+
+def frame_signature(gray, size=SIGNATURE_SIZE):
+    """
+    Perceptual signature of a grayscale frame: its size x size block means.
+
+    Unlike a global dHash, a person moving in front of a fixed background
+    changes several blocks by a large amount, while noise and compression
+    only change the block means by a few grey levels.
+    """
+    return cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+
+
+class SignatureIndex:
+    """
+    Recently saved frame signatures answering near-duplicate queries.
+
+    Two signatures are near-duplicates when at most max_distance blocks
+    differ by more than cell_threshold grey levels. Only the last `window`
+    saved frames are compared, so a pose that repeats later in the session
+    (e.g. the bottom of every squat) is kept.
+    """
+
+    def __init__(self, max_distance=2, cell_threshold=16, window=30, size=SIGNATURE_SIZE):
+        self.max_distance = max_distance
+        self.cell_threshold = cell_threshold
+        self.window = window
+        # Ring buffer of the last `window` signatures
+        self.signatures = np.empty((window, size, size), dtype=np.uint8)
+        self.count = 0
+
+    def is_duplicate(self, signature):
+        """Return True if a recent signature is within max_distance changed blocks."""
+        stored = self.signatures[:min(self.count, self.window)]
+        if len(stored) == 0:
+            return False
+        diff = np.abs(stored.astype(np.int16) - signature.astype(np.int16))
+        changed = (diff > self.cell_threshold).sum(axis=(1, 2))
+        return bool(changed.min() <= self.max_distance)
+
+    def add(self, signature, force=False):
+        """
+        Store a signature unless it is a near-duplicate (or force is set).
+        Returns True if it was added.
+        """
+        if not force and self.is_duplicate(signature):
+            return False
+        self.signatures[self.count % self.window] = signature
+        self.count += 1
+        return True
+
+
+def select_phase_frames(signal, frame_ids=None, min_gap=5, smooth=5):
+    """
+    Video frame numbers at the movement phases of a keypoint signal.
+
+    signal holds one value per row of a keypoint sequence and frame_ids the
+    0-based video frame number of each row (defaults to 0, 1, 2, ...), so
+    sparse sequences (frames without detection, reduced frame rate) map back
+    to the right frames. Returns the frame numbers of the local minima and
+    maxima of the smoothed signal (for example the bottom and top of each
+    squat when using the knee angle), keeping at least min_gap video frames
+    between selected frames. NaN values are interpolated.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    frame_ids = np.arange(len(signal)) if frame_ids is None else np.asarray(frame_ids)
+    if len(frame_ids) != len(signal):
+        raise ValueError(f"Got {len(frame_ids)} frame ids for {len(signal)} signal values")
+
+    valid = ~np.isnan(signal)
+    if valid.sum() < 3:
+        return []
+
+    signal = np.interp(frame_ids, frame_ids[valid], signal[valid])
+    if smooth > 1:
+        padded = np.pad(signal, (smooth // 2, smooth - 1 - smooth // 2), mode="edge")
+        signal = np.convolve(padded, np.ones(smooth) / smooth, mode="valid")
+
+    # Flat steps (equal neighbours) keep the previous direction so plateaus
+    # at a peak or valley are still detected
+    slope = np.sign(np.diff(signal))
+    nonzero = np.where(slope != 0, np.arange(len(slope)), 0)
+    slope = slope[np.maximum.accumulate(nonzero)]
+    turning = np.where(slope[1:] * slope[:-1] < 0)[0] + 1
+
+    selected = []
+    for frame_id in frame_ids[turning]:
+        if not selected or frame_id - selected[-1] >= min_gap:
+            selected.append(int(frame_id))
+    return selected
+
+
+def phase_frames_from_csv(csv_path, keypoints=("HIP", "KNEE", "ANKLE"), frame_size=None,
+                          min_gap=5, smooth=5):
+    """
+    0-based video frames at the movement phases of a keypoints CSV.
+
+    The signal is the angle at the middle of the three keypoints (by default
+    the knee angle of the experiments' CSV). CSV frame numbers are 1-based and
+    only frames with a detection have rows, so they are converted here.
+    """
+    sequence = KeypointSequence.from_csv(csv_path)
+    point_a, vertex, point_c = (sequence.point(name)[:, :2] for name in keypoints)
+    if frame_size is not None:
+        scale = np.array(frame_size, dtype=np.float32)
+        point_a, vertex, point_c = point_a * scale, vertex * scale, point_c * scale
+
+    angles = calculate_angle(point_a, vertex, point_c)
+    return select_phase_frames(angles, sequence.frame_ids - 1, min_gap, smooth)
+
+
+def extract_frames(video_path, output_dir=None, motion_threshold=8.0, min_gap=5,
+                   max_distance=2, frame_ids=None, phase_csv=None,
+                   phase_keypoints=("HIP", "KNEE", "ANKLE"), max_width=720, ext="jpg",
+                   quality=90, workers=4):
+    """
+    Extract informative, non-duplicated frames from a video.
+
+    By default a frame is selected once the mean absolute pixel difference
+    accumulated since the last selected frame exceeds motion_threshold. If
+    frame_ids is given (0-based video frame numbers, e.g. from
+    select_phase_frames or phase_frames_from_csv), only those frames are
+    candidates and all of them are saved. phase_csv computes them with
+    phase_frames_from_csv, using the frame size of the already opened video.
+    Other candidates are skipped when at most max_distance signature blocks
+    changed with respect to one of the recently saved frames.
+
+    Returns the list of saved image paths.
+    """
+    video_path = Path(video_path)
+    output_dir = Path(output_dir) if output_dir else FRAMES_DIR / video_path.stem
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if ext == "jpg":
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    elif ext == "webp":
+        params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+    else:
+        params = []
+
+    # With frame_ids, other frames are only grabbed (no colour conversion or resize)
+    reader = VideoReader(video_path, max_width, frame_ids=frame_ids)
+    if phase_csv is not None:
+        frame_ids = phase_frames_from_csv(phase_csv, phase_keypoints,
+                                          frame_size=(reader.width, reader.height),
+                                          min_gap=min_gap)
+        reader.frame_ids = set(frame_ids)
+        print(f"Found {len(frame_ids)} movement phase frames in {Path(phase_csv).name}")
+    index = SignatureIndex(max_distance)
+    prev_small = None
+    motion = 0.0
+    last_selected = -min_gap
+    duplicates = 0
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for frame_id, frame in reader:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+            if frame_ids is None:
+                h, w = gray.shape
+                small = cv2.resize(gray, (MOTION_WIDTH, max(1, h * MOTION_WIDTH // w)),
+                                   interpolation=cv2.INTER_AREA)
+                if prev_small is not None:
+                    motion += float(cv2.absdiff(small, prev_small).mean())
+                prev_small = small
+
+                is_first = frame_id == 0
+                if not is_first and (motion < motion_threshold or frame_id - last_selected < min_gap):
+                    continue
+
+            # Motion is consumed even by duplicates, so a static scene is not
+            # compared again on every following frame. Frames explicitly asked
+            # for (phase selection) are never dropped as duplicates
+            motion = 0.0
+            if not index.add(frame_signature(gray), force=frame_ids is not None):
+                duplicates += 1
+                continue
+
+            last_selected = frame_id
+            path = output_dir / f"{video_path.stem}_frame_{frame_id:06d}.{ext}"
+            futures.append(pool.submit(_write_image, path, frame, params))
+
+    saved = [future.result() for future in futures]
+    print(f"Saved {len(saved)} frames ({duplicates} near-duplicates skipped) in {output_dir} | "
+          f"Decode: {reader.decode_fps:.1f} FPS")
+    return saved
+
+
+def _write_image(path, frame, params):
+    """Encode and save one frame, raising if OpenCV fails."""
+    if not cv2.imwrite(str(path), frame, params):
+        raise IOError(f"Could not write frame to {path}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract informative, non-duplicated frames from a video."
+    )
+    parser.add_argument("--video", type=str, required=True, help="Path to the video.")
+    parser.add_argument("--output", type=str, default=None, help="Output directory.")
+    parser.add_argument("--motion", type=float, default=8.0,
+                        help="Accumulated motion needed to select a new frame.")
+    parser.add_argument("--phase-csv", type=str, default=None,
+                        help="Keypoints CSV of the video: select frames at the movement phases "
+                             "instead of by motion.")
+    parser.add_argument("--phase-keypoints", nargs=3, default=["HIP", "KNEE", "ANKLE"],
+                        help="Keypoints whose angle (at the middle one) defines the phases.")
+    parser.add_argument("--min-gap", type=int, default=5, help="Minimum frames between selections.")
+    parser.add_argument("--max-distance", type=int, default=2,
+                        help="Frames with at most this many changed signature blocks are near-duplicates.")
+    parser.add_argument("--max-width", type=int, default=720, help="Resize frames to this width.")
+    parser.add_argument("--ext", type=str, default="jpg", choices=["jpg", "png", "webp"])
+    parser.add_argument("--workers", type=int, default=4, help="Parallel encoding workers.")
+    args = parser.parse_args()
+
+    video_path = Path(args.video)
+    if not video_path.exists():
+        print(f"ERROR: File does not exist: {video_path}")
+        exit(1)
+
+    if args.phase_csv and not Path(args.phase_csv).exists():
+        print(f"ERROR: File does not exist: {args.phase_csv}")
+        exit(1)
+
+    extract_frames(
+        video_path,
+        output_dir=args.output,
+        motion_threshold=args.motion,
+        min_gap=args.min_gap,
+        max_distance=args.max_distance,
+        phase_csv=args.phase_csv,
+        phase_keypoints=args.phase_keypoints,
+        max_width=args.max_width,
+        ext=args.ext,
+        workers=args.workers,
+    )
 
 
+if __name__ == "__main__":
+    main()
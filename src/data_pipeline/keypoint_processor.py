@@ -1,7 +1,18 @@
 """
 Keypoint processing and normalization.
+
+Helpers that load keypoint files produced by the pipeline into the
+KeypointSequence container of src/core/keypoints.py.
 """
 
-# TODO: Implement keypoint processing
+from pathlib import Path
+
+from src.core.keypoints import KeypointSequence
 
 
+def load_sequence(path, dtype="float32"):
+    """Load a KeypointSequence from a keypoints CSV or a saved .npz file."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        return KeypointSequence.load(path).astype(dtype)
+    return KeypointSequence.from_csv(path, dtype=dtype)
@@ -0,0 +1,250 @@
+"""
+Resumable MediaPipe keypoint extraction for long videos and video archives.
+
+Writes the same keypoints CSV as the MediaPipe experiments
+(frame, keypoint, x, y, z, visibility, fps) and saves a checkpoint every few
+hundred frames. If a run is interrupted (Ctrl+C) or crashes, running it again
+truncates the CSV to the last checkpoint, seeks to that frame, primes the
+tracker with a few preceding frames and continues (resumed keypoints are close
+to, but not bit-identical with, an uninterrupted run). Videos whose checkpoint is
+marked as completed are skipped. CSVs are saved in:
+results/mediapipe/keypoints/
+
+Usage (from the project root):
+    python -m src.data_pipeline.process_videos --videos data/raw
+"""
+
+import argparse
+import csv
+import signal
+import time
+from pathlib import Path
+
+import cv2
+import mediapipe as mp
+
+from src.core.keypoints import landmarks_to_array
+from src.utils.checkpoint_utils import load_checkpoint, save_checkpoint
+from src.utils.video_utils import VideoReader
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+KEYPOINTS_DIR = PROJECT_ROOT / "results" / "mediapipe" / "keypoints"
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv"}
+
+CSV_HEADER = ["frame", "keypoint", "x", "y", "z", "visibility", "fps"]
+CHECKPOINT_EVERY = 200
+PRIME_FRAMES = 10
+
+# Same keypoints as experiments/02_mediapipe_test/mediapipe_advanced.py
+DEFAULT_KEYPOINTS = {
+    "SHOULDER": mp.solutions.pose.PoseLandmark.LEFT_SHOULDER,
+    "HIP": mp.solutions.pose.PoseLandmark.LEFT_HIP,
+    "KNEE": mp.solutions.pose.PoseLandmark.LEFT_KNEE,
+    "ANKLE": mp.solutions.pose.PoseLandmark.LEFT_ANKLE,
+    "HEEL": mp.solutions.pose.PoseLandmark.LEFT_HEEL,
+    "FOOT": mp.solutions.pose.PoseLandmark.LEFT_FOOT_INDEX,
+}
+
+
+def csv_name(video_path, model_complexity, min_det_conf, min_track_conf):
+    """CSV file name used by the experiments and parsed by analyze_keypoints."""
+    return (f"{Path(video_path).stem}_c{model_complexity}"
+            f"_d{int(min_det_conf*100)}_t{int(min_track_conf*100)}.csv")
+
+
+class _StopRequest:
+    """SIGINT handler that lets the current frame finish before stopping."""
+
+    def __init__(self):
+        self.requested = False
+
+    def __call__(self, sig, frame):
+        print("\n\nInterruption detected. Saving checkpoint...")
+        self.requested = True
+
+
+def process_video(video_path, csv_path, keypoints=None, model_complexity=2,
+                  min_det_conf=0.5, min_track_conf=0.5, max_width=720, target_fps=None,
+                  checkpoint_every=CHECKPOINT_EVERY, prime_frames=PRIME_FRAMES,
+                  hw_accel=False):
+    """
+    Extract MediaPipe keypoints of a video to CSV, resuming from its checkpoint.
+
+    Frame numbers in the CSV are 1-based positions in the original video,
+    also when target_fps keeps only part of the frames. hw_accel only changes
+    how frames are decoded, so it is not part of the checkpoint configuration.
+
+    Resumed output is approximate, not identical to an uninterrupted run:
+    MediaPipe's landmark smoothing and region of interest depend on every
+    previous frame, and priming only rebuilds that state from prime_frames
+    frames, so coordinates of the first frames after the resume point can
+    differ slightly. The fps column is wall-clock processing speed and
+    differs between any two runs.
+
+    Returns True if the video is fully processed and False if the run was
+    interrupted (the checkpoint then allows resuming it later).
+    """
+    video_path = Path(video_path)
+    csv_path = Path(csv_path)
+    keypoints = keypoints or DEFAULT_KEYPOINTS
+    names = list(keypoints)
+    indices = [int(kp) for kp in keypoints.values()]
+
+    reader = VideoReader(video_path, max_width, target_fps, hw_accel=hw_accel)
+    total_frames = reader.frame_count
+    config = {
+        "video": str(video_path.resolve()),
+        "video_size": video_path.stat().st_size,
+        "keypoints": dict(zip(names, indices)),
+        "model_complexity": model_complexity,
+        "min_detection_confidence": min_det_conf,
+        "min_tracking_confidence": min_track_conf,
+        "max_width": max_width,
+        "target_fps": target_fps,
+    }
+
+    checkpoint = load_checkpoint(csv_path, config)
+    if checkpoint and checkpoint["completed"]:
+        reader.close()
+        print(f"Skipping {video_path.name}: already processed ({csv_path.name})")
+        return True
+
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    if checkpoint:
+        last_frame = checkpoint["last_frame"]
+        processed_before = checkpoint.get("frames_processed", last_frame)
+        csv_file = open(csv_path, "r+", newline="", encoding="utf-8")
+        csv_file.seek(checkpoint["output_offset"])
+        csv_file.truncate()
+        print(f"Resuming {video_path.name} from frame {last_frame}/{total_frames}")
+    else:
+        last_frame = 0
+        processed_before = 0
+        csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+        csv.writer(csv_file).writerow(CSV_HEADER)
+    csv_writer = csv.writer(csv_file)
+
+    # Re-run the tracker on a few frames before the checkpoint (without
+    # writing them) so it resumes with a similar, not identical, temporal context
+    first_frame = max(0, last_frame - int(prime_frames * reader.frame_step))
+    reader.start_frame = first_frame
+
+    pose = mp.solutions.pose.Pose(
+        static_image_mode=False,
+        model_complexity=model_complexity,
+        enable_segmentation=False,
+        min_detection_confidence=min_det_conf,
+        min_tracking_confidence=min_track_conf,
+    )
+
+    stop = _StopRequest()
+    previous_handler = signal.signal(signal.SIGINT, stop)
+
+    def checkpoint_now(completed=False):
+        csv_file.flush()
+        save_checkpoint(csv_path, config, frame_id, csv_file.tell(), completed,
+                        frames_processed=processed_before + frames_processed)
+
+    frame_id = last_frame
+    frames_processed = 0
+    processing_start = time.time()
+    prev_frame_time = time.time()
+
+    try:
+        for frame_id, frame in reader:
+            frame_id += 1
+            curr_frame_time = time.time()
+            frame_fps = 1.0 / (curr_frame_time - prev_frame_time) if (curr_frame_time - prev_frame_time) > 0 else 0.0
+            prev_frame_time = curr_frame_time
+
+            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            image_rgb.flags.writeable = False
+            results = pose.process(image_rgb)
+
+            # Priming frames only warm up the tracker and are not counted
+            if frame_id <= last_frame:
+                continue
+            frames_processed += 1
+
+            if results.pose_landmarks:
+                values = landmarks_to_array(results.pose_landmarks.landmark, indices).tolist()
+                csv_writer.writerows(
+                    [frame_id, name, x, y, z, visibility, frame_fps]
+                    for name, (x, y, z, visibility) in zip(names, values)
+                )
+
+            if stop.requested:
+                checkpoint_now()
+                print(f"Checkpoint saved at frame {frame_id}. Run again to resume.")
+                return False
+
+            if frames_processed % checkpoint_every == 0:
+                checkpoint_now()
+
+            if frames_processed % 50 == 0 or frame_id == total_frames:
+                progress = (frame_id / total_frames) * 100 if total_frames else 0
+                elapsed = time.time() - processing_start
+                fps_processing = frames_processed / elapsed if elapsed > 0 else 0
+                print(f"Progress: {frame_id}/{total_frames} frames ({progress:.1f}%) | "
+                      f"FPS: {fps_processing:.1f} | Decode: {reader.decode_fps:.1f} FPS | "
+                      f"Time: {elapsed:.1f}s")
+
+        checkpoint_now(completed=True)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        reader.close()
+        pose.close()
+        csv_file.close()
+
+    processing_time = time.time() - processing_start
+    print(f"✓ {video_path.name}: {frames_processed} frames in {processing_time:.2f} s "
+          f"(decode {reader.decode_fps:.1f} FPS) -> {csv_path}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract MediaPipe keypoints from videos with resumable checkpoints."
+    )
+    parser.add_argument("--videos", nargs="+", required=True,
+                        help="Video files or directories containing videos.")
+    parser.add_argument("--output", type=str, default=str(KEYPOINTS_DIR), help="Output directory.")
+    parser.add_argument("--complexity", type=int, default=2, choices=[0, 1, 2])
+    parser.add_argument("--det-conf", type=float, default=0.5)
+    parser.add_argument("--track-conf", type=float, default=0.5)
+    parser.add_argument("--max-width", type=int, default=720, help="Resize frames to this width.")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="Process videos at this frame rate (skipped frames are not decoded).")
+    parser.add_argument("--hw-accel", action="store_true",
+                        help="Use hardware video decoding when available.")
+    args = parser.parse_args()
+
+    videos = []
+    for path in map(Path, args.videos):
+        if path.is_dir():
+            videos.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS))
+        elif path.exists():
+            videos.append(path)
+        else:
+            print(f"ERROR: File does not exist: {path}")
+            exit(1)
+
+    output_dir = Path(args.output)
+    for video_path in videos:
+        csv_path = output_dir / csv_name(video_path, args.complexity, args.det_conf, args.track_conf)
+        completed = process_video(
+            video_path, csv_path,
+            model_complexity=args.complexity,
+            min_det_conf=args.det_conf,
+            min_track_conf=args.track_conf,
+            max_width=args.max_width,
+            target_fps=args.fps,
+            hw_accel=args.hw_accel,
+        )
+        if not completed:
+            break
+
+
+if __name__ == "__main__":
+    main()
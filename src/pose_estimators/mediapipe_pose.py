@@ -2,6 +2,45 @@
 Pose estimation implementation using MediaPipe.
 """
 
-# TODO: Implement MediaPipe pose estimation
+import cv2
+import mediapipe as mp
 
+from src.core.keypoints import landmarks_to_array
+from src.core.skeleton import MEDIAPIPE_INDICES
 
+
+class MediaPipePose:
+    """MediaPipe Pose wrapper returning keypoints in the common skeleton."""
+
+    name = "mediapipe"
+
+    def __init__(self, model_complexity=1, min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5):
+        self.pose = mp.solutions.pose.Pose(
+            static_image_mode=False,
+            model_complexity=model_complexity,
+            enable_segmentation=False,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+
+    def process(self, frame):
+        """
+        Run the model on a BGR frame.
+
+        Returns an array of shape (17, 3) with normalized x, y and visibility
+        for each common keypoint, or None if no person was detected.
+        """
+        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image_rgb.flags.writeable = False
+        results = self.pose.process(image_rgb)
+
+        if not results.pose_landmarks:
+            return None
+
+        keypoints = landmarks_to_array(results.pose_landmarks.landmark, MEDIAPIPE_INDICES)
+        return keypoints[:, [0, 1, 3]]
+
+    def close(self):
+        """Release model resources."""
+        self.pose.close()
@@ -2,6 +2,61 @@
 Pose estimation implementation using MoveNet.
 """
 
-# TODO: Implement MoveNet pose estimation
+import cv2
+import numpy as np
 
+MOVENET_MODELS = {
+    "lightning": ("https://tfhub.dev/google/movenet/singlepose/lightning/4", 192),
+    "thunder": ("https://tfhub.dev/google/movenet/singlepose/thunder/4", 256),
+}
 
+
+class MoveNetPose:
+    """MoveNet SinglePose wrapper returning keypoints in the common skeleton."""
+
+    name = "movenet"
+
+    def __init__(self, variant="thunder", min_score=0.2):
+        # TensorFlow is only needed when MoveNet is actually used
+        import tensorflow as tf
+        import tensorflow_hub as hub
+
+        url, self.input_size = MOVENET_MODELS[variant]
+        self.tf = tf
+        self.min_score = min_score
+        self.model = hub.load(url).signatures["serving_default"]
+
+    def process(self, frame):
+        """
+        Run the model on a BGR frame.
+
+        Returns an array of shape (17, 3) with normalized x, y and score
+        for each common keypoint, or None if no person was detected.
+
+        MoveNet always outputs 17 keypoints, also without a person in the
+        frame, so the detection counts as empty when the mean keypoint
+        score is below min_score.
+        """
+        h, w = frame.shape[:2]
+        size = max(h, w)
+
+        # Pad to a square canvas so the aspect ratio is preserved
+        canvas = np.zeros((size, size, 3), dtype=np.uint8)
+        canvas[:h, :w] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image = cv2.resize(canvas, (self.input_size, self.input_size))
+
+        inputs = self.tf.constant(image[np.newaxis], dtype=self.tf.int32)
+        outputs = self.model(inputs)["output_0"].numpy()[0, 0]
+
+        keypoints = np.empty((outputs.shape[0], 3), dtype=np.float32)
+        keypoints[:, 0] = outputs[:, 1] * size / w
+        keypoints[:, 1] = outputs[:, 0] * size / h
+        keypoints[:, 2] = outputs[:, 2]
+
+        if keypoints[:, 2].mean() < self.min_score:
+            return None
+        return keypoints
+
+    def close(self):
+        """Release model resources."""
+        self.model = None
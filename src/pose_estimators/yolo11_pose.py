@@ -2,6 +2,43 @@
 Pose estimation implementation using YOLO11 Pose.
 """
 
-# TODO: Implement YOLO11 Pose estimation
+import numpy as np
 
 
+class Yolo11Pose:
+    """YOLO11 Pose wrapper returning keypoints in the common skeleton."""
+
+    name = "yolo11"
+
+    def __init__(self, weights="yolo11n-pose.pt", conf=0.5):
+        # Ultralytics is only needed when YOLO11 is actually used
+        from ultralytics import YOLO
+
+        self.model = YOLO(weights)
+        self.conf = conf
+
+    def process(self, frame):
+        """
+        Run the model on a BGR frame.
+
+        Returns an array of shape (17, 3) with normalized x, y and confidence
+        for each common keypoint of the most confident person, or None if no
+        person was detected.
+        """
+        results = self.model(frame, conf=self.conf, verbose=False)[0]
+
+        if results.keypoints is None or len(results.boxes) == 0:
+            return None
+
+        best = int(results.boxes.conf.argmax())
+        xyn = results.keypoints.xyn[best].cpu().numpy()
+        scores = results.keypoints.conf[best].cpu().numpy()
+
+        keypoints = np.empty((xyn.shape[0], 3), dtype=np.float32)
+        keypoints[:, :2] = xyn
+        keypoints[:, 2] = scores
+        return keypoints
+
+    def close(self):
+        """Release model resources."""
+        self.model = None
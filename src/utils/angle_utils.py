@@ -2,6 +2,59 @@
 Utilities for calculating angles between keypoints.
 """
 
-# TODO: Implement angle calculation functions
+import numpy as np
 
+# Joint angles of interest, defined as (point_a, vertex, point_c) over the
+# common keypoint names of src/core/skeleton.py
+JOINT_ANGLES = {
+    "left_elbow": ("left_shoulder", "left_elbow", "left_wrist"),
+    "right_elbow": ("right_shoulder", "right_elbow", "right_wrist"),
+    "left_shoulder": ("left_elbow", "left_shoulder", "left_hip"),
+    "right_shoulder": ("right_elbow", "right_shoulder", "right_hip"),
+    "left_hip": ("left_shoulder", "left_hip", "left_knee"),
+    "right_hip": ("right_shoulder", "right_hip", "right_knee"),
+    "left_knee": ("left_hip", "left_knee", "left_ankle"),
+    "right_knee": ("right_hip", "right_knee", "right_ankle"),
+}
 
+
+def calculate_angle(a, b, c):
+    """
+    Angle in degrees at vertex b formed by points a-b-c.
+
+    Accepts single points or arrays of points with shape (..., 2) and returns
+    one angle per point triplet. Missing points (NaN) produce NaN angles.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    ba = a - b
+    bc = c - b
+    norms = np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cosine = np.sum(ba * bc, axis=-1) / norms
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def sequence_angles(sequence, frame_size=None, min_score=0.0, angles=JOINT_ANGLES):
+    """
+    Joint angles over a KeypointSequence, shape (frames, len(angles)).
+
+    With frame_size (width, height) angles are measured in pixel space, which
+    avoids the distortion of normalized coordinates on non-square frames.
+    """
+    if frame_size is not None:
+        points = sequence.to_pixels(frame_size, min_score)
+    else:
+        points = sequence.coords[..., :2]
+        points[~(sequence.visibility >= min_score)] = np.nan
+
+    index = {name: i for i, name in enumerate(sequence.keypoint_names)}
+    return np.stack(
+        [
+            calculate_angle(points[:, index[a]], points[:, index[b]], points[:, index[c]])
+            for a, b, c in angles.values()
+        ],
+        axis=-1,
+    )
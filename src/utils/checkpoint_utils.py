@@ -0,0 +1,77 @@
+"""
+Utilities for checkpointing long-running processing jobs.
+
+A checkpoint is a small JSON file stored next to the job output. It records
+the last completed frame, the byte offset of the output at that frame, the
+number of frames processed so far and the configuration of the run, so an interrupted job can resume exactly where
+it stopped and a finished job is never run again.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def checkpoint_path(output_path):
+    """Checkpoint file associated with an output file."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".checkpoint.json")
+
+
+def read_checkpoint(output_path):
+    """Return the saved checkpoint of output_path as a dict, or None if there is none."""
+    path = checkpoint_path(output_path)
+    if not path.exists():
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_checkpoint(output_path, config):
+    """
+    Return the saved checkpoint of output_path, or None if there is none,
+    the output file is missing or the checkpoint was made with another
+    configuration.
+    """
+    path = checkpoint_path(output_path)
+    if not Path(output_path).exists():
+        return None
+
+    checkpoint = read_checkpoint(output_path)
+    if checkpoint is None:
+        return None
+
+    if checkpoint.get("config") != config:
+        print(f"Checkpoint {path.name} was made with another configuration. Starting from scratch.")
+        return None
+    return checkpoint
+
+
+def save_checkpoint(output_path, config, last_frame, output_offset, completed=False,
+                    frames_processed=None):
+    """
+    Atomically write the checkpoint of output_path.
+
+    frames_processed is the number of frames processed up to last_frame,
+    which differs from last_frame when frames are skipped (e.g. a reduced
+    frame rate).
+    """
+    path = checkpoint_path(output_path)
+    checkpoint = {
+        "last_frame": last_frame,
+        "output_offset": output_offset,
+        "frames_processed": last_frame if frames_processed is None else frames_processed,
+        "completed": completed,
+        "config": config,
+        "updated": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return checkpoint
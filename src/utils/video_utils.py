@@ -2,6 +2,153 @@
 Utilities for video processing.
 """
 
-# TODO: Implement video utility functions
+import math
+import time
 
+import cv2
+
+
+class VideoReader:
+    """
+    Sequential video reader that opens the file once.
+
+    Metadata (fps, frame count, size) is probed when the reader is created.
+    Iterating yields (frame_id, frame) with the 0-based index of the frame in
+    the original video. Frames that are not wanted, because of target_fps or
+    frame_ids, are only grabbed (advancing the stream) and never retrieved,
+    so they skip the colour conversion and resizing. Returned frames are BGR,
+    downscaled to max_width when given. hw_accel asks OpenCV for hardware
+    decoding (it falls back to software when none is available).
+
+    Decode statistics are available while and after iterating through
+    frames_grabbed, frames_returned, decode_time and decode_fps.
+    """
+
+    def __init__(self, video_path, max_width=None, target_fps=None, start_frame=0,
+                 max_frames=None, frame_ids=None, hw_accel=False):
+        self.video_path = video_path
+        self.max_width = max_width
+        self.target_fps = target_fps
+        self.start_frame = start_frame
+        self.max_frames = max_frames
+        self.frame_ids = set(frame_ids) if frame_ids is not None else None
+
+        if hw_accel:
+            self.cap = cv2.VideoCapture(
+                str(video_path), cv2.CAP_ANY,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+        else:
+            self.cap = cv2.VideoCapture(str(video_path))
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video file at {video_path}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        self.frames_grabbed = 0
+        self.frames_returned = 0
+        self.decode_time = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the underlying capture."""
+        self.cap.release()
+
+    @property
+    def info(self):
+        """Metadata dict with fps, frame_count, width and height."""
+        return {
+            "fps": self.fps,
+            "frame_count": self.frame_count,
+            "width": self.width,
+            "height": self.height,
+        }
+
+    @property
+    def output_size(self):
+        """(width, height) of the returned frames."""
+        if self.max_width and self.width > self.max_width:
+            return self.max_width, int(self.height * (self.max_width / self.width))
+        return self.width, self.height
+
+    @property
+    def frame_step(self):
+        """Source frames per returned frame in target_fps mode (1.0 otherwise)."""
+        if self.target_fps and self.fps > self.target_fps:
+            return self.fps / self.target_fps
+        return 1.0
+
+    @property
+    def decode_fps(self):
+        """Frames decoded per second of time spent in the reader."""
+        return self.frames_grabbed / self.decode_time if self.decode_time > 0 else 0.0
+
+    def __iter__(self):
+        if self.start_frame:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+
+        # Keep one frame every fps / target_fps source frames, on a grid
+        # anchored at frame 0 so a seek keeps the same frames as a full read
+        step = self.frame_step
+        next_kept = (math.floor((self.start_frame - 0.5) / step) + 1) * step
+        frame_id = self.start_frame
+        last_wanted = max(self.frame_ids, default=-1) if self.frame_ids is not None else None
+        returned = 0
+
+        try:
+            while self.max_frames is None or returned < self.max_frames:
+                if last_wanted is not None and frame_id > last_wanted:
+                    break
+                start = time.perf_counter()
+                if not self.cap.grab():
+                    break
+                self.frames_grabbed += 1
+
+                wanted = frame_id + 0.5 >= next_kept
+                if wanted:
+                    next_kept += step
+                if self.frame_ids is not None:
+                    wanted = frame_id in self.frame_ids
+
+                if not wanted:
+                    self.decode_time += time.perf_counter() - start
+                    frame_id += 1
+                    continue
+
+                ret, frame = self.cap.retrieve()
+                if not ret:
+                    break
+                if self.max_width:
+                    frame = resize_to_width(frame, self.max_width)
+                self.decode_time += time.perf_counter() - start
+                self.frames_returned += 1
+                returned += 1
+
+                yield frame_id, frame
+                frame_id += 1
+        finally:
+            self.close()
+
+
+def get_video_info(video_path):
+    """Return basic metadata (fps, frame count, width, height) of a video."""
+    with VideoReader(video_path) as reader:
+        return reader.info
+
+
+def resize_to_width(frame, max_width=720):
+    """Downscale a frame so its width does not exceed max_width."""
+    h, w = frame.shape[:2]
+    if w > max_width:
+        scale = max_width / w
+        frame = cv2.resize(frame, (max_width, int(h * scale)))
+    return frame
 